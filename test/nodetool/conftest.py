@@ -4,19 +4,26 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
 #
 
+import fcntl
+import functools
+import json
 import os
 import pytest
 import random
 import rest_api_mock
+import socket
+import struct
 import subprocess
 import sys
-import requests.exceptions
 import time
-from typing import NamedTuple
+from typing import NamedTuple, Optional
 
 from rest_api_mock import expected_request
 
 
+_HERE = os.path.dirname(os.path.abspath(__file__))
+
+
 def pytest_addoption(parser):
     parser.addoption('--mode', action='store', default='dev',
                      help='Scylla build mode to use')
@@ -35,95 +42,126 @@ def pytest_addoption(parser):
 class ServerAddress(NamedTuple):
     ip: str
     port: int
+    # path of the Unix domain socket serving the control RPCs (setting and
+    # retrieving expected requests), the TCP ip:port serves the mocked API
+    sock: Optional[str] = None
 
 
-@pytest.fixture(scope="session")
-def server_address(request):
+def _bring_up_loopback():
+    # equivalent of `ip link set lo up`, without having to spawn a process
+    IFF_UP = 0x1
+    SIOCGIFFLAGS = 0x8913
+    SIOCSIFFLAGS = 0x8914
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+        ifreq = struct.pack('16sh', b'lo', 0)
+        flags = struct.unpack('16sh', fcntl.ioctl(s, SIOCGIFFLAGS, ifreq))[1]
+        fcntl.ioctl(s, SIOCSIFFLAGS, struct.pack('16sh', b'lo', flags | IFF_UP))
+
+
+def _pick_server_address(config):
     # unshare(1) -rn drops us in a new network namespace in which the "lo" is
     # not up yet, so let's set it up first.
-    if request.config.getoption('--run-within-unshare'):
-        try:
-            args = "ip link set lo up".split()
-            subprocess.run(args, check=True)
-        except FileNotFoundError:
-            args = "/sbin/ifconfig lo up".split()
-            subprocess.run(args, check=True)
+    if config.getoption('--run-within-unshare'):
+        _bring_up_loopback()
         # we use a fixed ip and port, because the network namespace is not shared
         ip = '127.0.0.1'
         port = 12345
     else:
         ip = f"127.{random.randint(0, 255)}.{random.randint(0, 255)}.{random.randint(0, 255)}"
-        port = random.randint(10000, 65535)
-    yield ServerAddress(ip, port)
-
-
-@pytest.fixture(scope="session")
-def rest_api_mock_server(request, server_address):
-    server_process = subprocess.Popen([sys.executable,
-                                       os.path.join(os.path.dirname(__file__), "rest_api_mock.py"),
+        port = _pick_free_port(ip)
+    return ServerAddress(ip, port, f"/tmp/scylla-nodetool-{os.getpid()}.sock")
+
+
+def _pick_free_port(ip):
+    # let the kernel pick a free ephemeral port, instead of gambling with
+    # random.randint() and risking a collision with a port already in use
+    s = socket.socket()
+    s.bind((ip, 0))
+    port = s.getsockname()[1]
+    s.close()
+    return port
+
+
+def _start_mock_server(server_address):
+    # launch the interpreter with -S, handing it our already-computed sys.path
+    # instead: skipping the site module's site-packages scan (and any .pth
+    # files) makes the mock listen sooner
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in sys.path if p))
+    # close_fds=False (together with not using preexec_fn) lets CPython spawn
+    # the child via posix_spawn() instead of fork() + exec(), skipping the
+    # copy of pytest's sizeable page tables
+    server_process = subprocess.Popen([sys.executable, "-S",
+                                       os.path.join(_HERE, "rest_api_mock.py"),
                                        server_address.ip,
-                                       str(server_address.port)])
-    # wait 5 seconds for the expected requests
+                                       str(server_address.port),
+                                       server_address.sock],
+                                      env=env, close_fds=False)
+    # wait 5 seconds for the server to start listening, polling with
+    # exponential backoff: the server usually binds in a few milliseconds, so
+    # start with a short sleep and only back off towards a coarser interval if
+    # it doesn't; probe with a bare TCP connect, which is much cheaper than a
+    # full HTTP round-trip
     timeout = 5
-    interval = 0.1
-    for _ in range(int(timeout / interval)):
+    deadline = time.monotonic() + timeout
+    delay = 0.005
+    while time.monotonic() < deadline:
         returncode = server_process.poll()
         if returncode is not None:
             # process terminated
             raise subprocess.CalledProcessError(returncode, server_process.args)
         try:
-            rest_api_mock.get_expected_requests(server_address)
+            s = socket.socket()
+            s.settimeout(0.05)
+            s.connect((server_address.ip, server_address.port))
+            s.close()
             break
-        except requests.exceptions.ConnectionError:
-            time.sleep(interval)
+        except OSError:
+            time.sleep(delay)
+            delay = min(delay * 2, 0.1)
     else:
         server_process.terminate()
         server_process.wait()
         raise subprocess.TimeoutExpired(server_process.args, timeout)
 
-    try:
-        yield server_address
-    finally:
-        server_process.terminate()
-        server_process.wait()
-
-
-@pytest.fixture(scope="session")
-def jmx(request, rest_api_mock_server):
-    if request.config.getoption("nodetool") == "scylla":
-        yield
-        return
-
-    jmx_path = request.config.getoption("jmx_path")
+    # confirm that the HTTP app is up too, not just the listening socket
+    rest_api_mock.get_expected_requests(server_address)
+
+    return server_process
+
+
+# The requests scylla-jmx issues on startup, their consumption doubles as its
+# readiness signal (see the jmx fixture). The list never changes, so it is
+# serialized once, at import time.
+_JMX_STARTUP_REQUESTS_PAYLOAD = json.dumps([r.as_json() for r in [
+        expected_request(
+            "GET",
+            "/column_family/",
+            response=[{"ks": "system_schema",
+                       "cf": "columns",
+                       "type": "ColumnFamilies"},
+                      {"ks": "system_schema",
+                       "cf": "computed_columns",
+                       "type": "ColumnFamilies"}]),
+        expected_request(
+            "GET",
+            "/stream_manager/",
+            response=[])]]).encode()
+
+
+def _start_jmx(config, server_address):
+    jmx_path = config.getoption("jmx_path")
     if jmx_path is None:
-        jmx_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "tools", "jmx", "scripts",
-                                                "scylla-jmx"))
+        jmx_path = os.path.abspath(os.path.join(_HERE, "..", "..", "tools", "jmx", "scripts", "scylla-jmx"))
     else:
         jmx_path = os.path.abspath(jmx_path)
 
     workdir = os.path.join(os.path.dirname(jmx_path), "..")
-    ip, api_port = rest_api_mock_server
-    expected_requests = [
-            expected_request(
-                "GET",
-                "/column_family/",
-                response=[{"ks": "system_schema",
-                           "cf": "columns",
-                           "type": "ColumnFamilies"},
-                          {"ks": "system_schema",
-                           "cf": "computed_columns",
-                           "type": "ColumnFamilies"}]),
-            expected_request(
-                "GET",
-                "/stream_manager/",
-                response=[])]
-    rest_api_mock.set_expected_requests(rest_api_mock_server, expected_requests)
+    ip, api_port = server_address.ip, server_address.port
+    rest_api_mock.set_expected_requests_raw(server_address, _JMX_STARTUP_REQUESTS_PAYLOAD)
 
     # Our nodetool launcher script ignores the host param, so this has to be 127.0.0.1, matching the internal default.
     jmx_ip = "127.0.0.1"
-    jmx_port = random.randint(10000, 65535)
-    while jmx_port == api_port:
-        jmx_port = random.randint(10000, 65535)
+    jmx_port = _pick_free_port(jmx_ip)
 
     jmx_process = subprocess.Popen(
             [
@@ -133,21 +171,102 @@ def jmx(request, rest_api_mock_server):
                 "-ja", jmx_ip,
                 "-jp", str(jmx_port),
             ],
-            cwd=workdir, text=True)
+            cwd=workdir, text=True, close_fds=False)
+
+    return jmx_process, jmx_ip, jmx_port
+
+
+def pytest_configure(config):
+    # resolved once here, the options are consulted per test and on every
+    # nodetool invocation
+    config._nodetool_impl = config.getoption("nodetool")
+    config._mode = config.getoption("mode")
+
+    config.addinivalue_line("markers", "scylla_only: run only against the scylla-native nodetool")
+    config.addinivalue_line("markers", "cassandra_only: run only against the C*-based nodetool")
+
+
+def pytest_collection_modifyitems(config, items):
+    # evaluate the scylla_only/cassandra_only markers once, at collection
+    # time, instead of paying for a skip-or-not fixture on every test
+    if config._nodetool_impl == "scylla":
+        skip_marker, reason = "cassandra_only", "Cassandra-only test skipped"
+    else:
+        skip_marker, reason = "scylla_only", "Scylla-only test skipped"
+    skip = pytest.mark.skip(reason=reason)
+    for item in items:
+        if item.get_closest_marker(skip_marker) is not None:
+            item.add_marker(skip)
+
+
+def pytest_sessionstart(session):
+    config = session.config
+    config._server_address = _pick_server_address(config)
+    config._mock_server_process = _start_mock_server(config._server_address)
+    # Launch JMX right away, so that the JVM warms up in the background, in
+    # parallel with test collection, instead of delaying the first test.
+    # Waiting for it to be ready is deferred to the first use (the jmx
+    # fixture).
+    if config._nodetool_impl == "cassandra":
+        config._jmx_state = _start_jmx(config, config._server_address)
+    else:
+        config._jmx_state = None
+
+
+def _stop_process(process):
+    # give the child a short grace period to exit on SIGTERM, then escalate to
+    # SIGKILL: a hung child must not hang the whole session's teardown
+    process.terminate()
+    try:
+        process.wait(timeout=0.5)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def pytest_sessionfinish(session):
+    jmx_state = getattr(session.config, "_jmx_state", None)
+    if jmx_state is not None:
+        jmx_process, _, _ = jmx_state
+        _stop_process(jmx_process)
+
+    server_process = getattr(session.config, "_mock_server_process", None)
+    if server_process is not None:
+        _stop_process(server_process)
+
+    # the mock server has no chance to unlink its control socket when
+    # terminated, clean it up on its behalf
+    server_address = getattr(session.config, "_server_address", None)
+    if server_address is not None and server_address.sock is not None:
+        try:
+            os.unlink(server_address.sock)
+        except FileNotFoundError:
+            pass
+
+
+@pytest.fixture(scope="session")
+def server_address(request):
+    return request.config._server_address
+
+
+@pytest.fixture(scope="session")
+def rest_api_mock_server(request, server_address):
+    return server_address
+
+
+@pytest.fixture(scope="session")
+def jmx(request, rest_api_mock_server):
+    if request.config._nodetool_impl == "scylla":
+        return
+
+    jmx_process, jmx_ip, jmx_port = request.config._jmx_state
 
     # Wait until jmx starts up
     # We rely on the expected requests being consumed for this
-    i = 0
-    while len(rest_api_mock.get_expected_requests(rest_api_mock_server)) > 0:
-        if i == 50:  # 5 seconds
-            raise RuntimeError("timed out waiting for JMX to start")
-        time.sleep(0.1)
-        i += 1
-
-    yield jmx_ip, jmx_port
+    if not rest_api_mock.wait_drained(rest_api_mock_server, timeout=5):
+        raise RuntimeError("timed out waiting for JMX to start")
 
-    jmx_process.terminate()
-    jmx_process.wait()
+    return jmx_ip, jmx_port
 
 
 all_modes = {'debug': 'Debug',
@@ -157,8 +276,9 @@ all_modes = {'debug': 'Debug',
              'coverage': 'Coverage'}
 
 
+@functools.lru_cache(maxsize=None)
 def _path_to_scylla(mode):
-    build_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "build"))
+    build_dir = os.path.abspath(os.path.join(_HERE, "..", "..", "build"))
     if os.path.exists(os.path.join(build_dir, 'build.ninja')):
         return os.path.join(build_dir, all_modes[mode], "scylla")
     return os.path.join(build_dir, mode, "scylla")
@@ -166,57 +286,69 @@ def _path_to_scylla(mode):
 
 @pytest.fixture(scope="session")
 def nodetool_path(request):
-    if request.config.getoption("nodetool") == "scylla":
-        mode = request.config.getoption("mode")
-        return _path_to_scylla(mode)
+    if request.config._nodetool_impl == "scylla":
+        return _path_to_scylla(request.config._mode)
 
     path = request.config.getoption("nodetool_path")
     if path is not None:
         return os.path.abspath(path)
 
-    return os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "tools", "java", "bin", "nodetool"))
-
+    return os.path.abspath(os.path.join(_HERE, "..", "..", "tools", "java", "bin", "nodetool"))
 
-@pytest.fixture(scope="function")
-def scylla_only(request):
-    if request.config.getoption("nodetool") != "scylla":
-        pytest.skip('Scylla-only test skipped')
 
-
-@pytest.fixture(scope="function")
-def cassandra_only(request):
-    if request.config.getoption("nodetool") != "cassandra":
-        pytest.skip('Cassandra-only test skipped')
-
-
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def nodetool(request, jmx, nodetool_path, rest_api_mock_server):
-    def invoker(method, *args, expected_requests=None):
+    # Build the fixed part of the command-line once, the invoker only appends
+    # the method and its arguments.
+    if request.config._nodetool_impl == "scylla":
+        api_ip, api_port = rest_api_mock_server.ip, rest_api_mock_server.port
+        cmd_prefix = [nodetool_path, "nodetool"]
+        cmd_opts = ["--logger-log-level", "scylla-nodetool=trace",
+                    "-h", api_ip,
+                    "-p", str(api_port)]
+    else:
+        jmx_ip, jmx_port = jmx
+        cmd_prefix = [nodetool_path, "-h", jmx_ip, "-p", str(jmx_port)]
+        cmd_opts = []
+
+    def invoker(method, *args, expected_requests=None, capture=True):
         if expected_requests is not None:
             rest_api_mock.set_expected_requests(rest_api_mock_server, expected_requests)
 
-        if request.config.getoption("nodetool") == "scylla":
-            api_ip, api_port = rest_api_mock_server
-            cmd = [nodetool_path, "nodetool", method,
-                   "--logger-log-level", "scylla-nodetool=trace",
-                   "-h", api_ip,
-                   "-p", str(api_port)]
+        cmd = cmd_prefix + [method] + cmd_opts + list(args)
+        if capture:
+            # close_fds=False skips closing all open file descriptors on every
+            # spawn, the test harness has no sensitive inherited fds to protect;
+            # capture as bytes (no text=True) and decode lazily below
+            res = subprocess.run(cmd, capture_output=True, close_fds=False)
         else:
-            jmx_ip, jmx_port = jmx
-            cmd = [nodetool_path, "-h", jmx_ip, "-p", str(jmx_port), method]
-        cmd += list(args)
-        res = subprocess.run(cmd, capture_output=True, text=True)
-        sys.stdout.write(res.stdout)
-        sys.stderr.write(res.stderr)
+            # the caller is not interested in the output, don't even allocate
+            # the pipes for it
+            res = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                 close_fds=False)
 
-        unconsumed_expected_requests = rest_api_mock.get_expected_requests(rest_api_mock_server)
-        # Clear up any unconsumed requests, so the next test starts with a clean slate
-        rest_api_mock.clear_expected_requests(rest_api_mock_server)
+        # One small status round-trip on the common success path, instead of
+        # fetching and clearing the whole expected-requests list
+        status = rest_api_mock.get_expected_requests_status(rest_api_mock_server)
 
         # Check the return-code first, if the command failed probably not all requests were consumed
-        res.check_returncode()
-        assert len(unconsumed_expected_requests) == 0
-
-        return res.stdout
+        if res.returncode != 0 or status["remaining"] > 0:
+            # The failure report needs the unconsumed requests themselves,
+            # fetch and clear them so the next test starts with a clean slate
+            unconsumed_expected_requests = rest_api_mock.get_and_clear_expected_requests(rest_api_mock_server)
+            # Emit the output only when something went wrong, on success
+            # nobody reads it and pytest would capture and store it all
+            stdout = stderr = None
+            if capture:
+                stdout = res.stdout.decode("utf-8", "replace")
+                stderr = res.stderr.decode("utf-8", "replace")
+                sys.stdout.write(stdout)
+                sys.stderr.write(stderr)
+            if res.returncode != 0:
+                raise subprocess.CalledProcessError(res.returncode, res.args, output=stdout, stderr=stderr)
+            assert len(unconsumed_expected_requests) == 0
+
+        # stderr is typically empty on success, never pay a UTF-8 pass for it
+        return res.stdout.decode("utf-8", "replace") if capture else None
 
     return invoker
@@ -9,7 +9,10 @@ import aiohttp.web
 import asyncio
 import json
 import logging
+import os
 import requests
+import socket
+import struct
 import sys
 import traceback
 
@@ -18,6 +21,12 @@ from typing import Any, Dict, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Reuse a single HTTP session (and hence TCP connection) for all requests to
+# the mock server, instead of paying for a connection setup + teardown on
+# every call.
+_session = requests.Session()
+_session.mount("http://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=4))
+
 
 class approximate_value:
     """
@@ -131,11 +140,27 @@ class handler_match_info(aiohttp.abc.AbstractMatchInfo):
 
 class rest_server(aiohttp.abc.AbstractRouter):
     EXPECTED_REQUESTS_PATH = "__expected_requests__"
+    EXPECTED_REQUESTS_DRAINED_PATH = "__expected_requests__/drained"
+    EXPECTED_REQUESTS_STATUS_PATH = "__expected_requests__/status"
 
     def __init__(self):
         self.expected_requests = []
+        self._expected_requests_changed = asyncio.Condition()
+        # monotonic token identifying the currently set batch, see _status()
+        self._token = 0
+        self._batch_size = 0
+
+    async def _notify_expected_requests_changed(self):
+        async with self._expected_requests_changed:
+            self._expected_requests_changed.notify_all()
 
     async def resolve(self, request: aiohttp.web.Request) -> aiohttp.abc.AbstractMatchInfo:
+        if request.path == f"/{self.EXPECTED_REQUESTS_DRAINED_PATH}":
+            return handler_match_info(self.get_expected_requests_drained)
+
+        if request.path == f"/{self.EXPECTED_REQUESTS_STATUS_PATH}":
+            return handler_match_info(self.get_expected_requests_status)
+
         if request.path == f"/{self.EXPECTED_REQUESTS_PATH}":
             return handler_match_info(getattr(self, f"{request.method.lower()}_expected_requests"))
 
@@ -145,18 +170,103 @@ class rest_server(aiohttp.abc.AbstractRouter):
 
         raise aiohttp.web.HTTPNotFound()
 
+    def _set_requests(self, payload):
+        self.expected_requests = list(map(_make_expected_request, payload))
+        self._token += 1
+        self._batch_size = len(self.expected_requests)
+        logger.info(f"expected_requests: {list(map(str, self.expected_requests))}")
+        return {"token": self._token, "count": self._batch_size}
+
+    def _status(self):
+        remaining = len(self.expected_requests)
+        return {"token": self._token, "consumed": self._batch_size - remaining, "remaining": remaining}
+
+    def _requests_as_json(self):
+        return [r.as_json() for r in self.expected_requests]
+
+    def _take_requests_as_json(self):
+        unconsumed = self._requests_as_json()
+        self.expected_requests = []
+        return unconsumed
+
+    async def _wait_drained(self, timeout):
+        try:
+            async with self._expected_requests_changed:
+                await asyncio.wait_for(
+                        self._expected_requests_changed.wait_for(lambda: len(self.expected_requests) == 0),
+                        timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
     async def get_expected_requests(self, request: aiohttp.web.Request) -> aiohttp.web.Response:
-        return aiohttp.web.json_response([r.as_json() for r in self.expected_requests])
+        return aiohttp.web.json_response(self._requests_as_json())
+
+    async def get_expected_requests_drained(self, request: aiohttp.web.Request) -> aiohttp.web.Response:
+        """Long-poll until all expected requests have been consumed.
+
+        Blocks until the expected requests list becomes empty (or the given
+        timeout expires), sparing the client a polling loop of one request per
+        poll.
+        """
+        drained = await self._wait_drained(float(request.query.get("timeout", 5)))
+        return aiohttp.web.json_response({"drained": drained})
+
+    async def get_expected_requests_status(self, request: aiohttp.web.Request) -> aiohttp.web.Response:
+        """Report how much of the last set batch has been consumed.
+
+        A single small response, letting clients verify that all expected
+        requests arrived without transferring the list itself.
+        """
+        return aiohttp.web.json_response(self._status())
 
     async def post_expected_requests(self, request: aiohttp.web.Request) -> aiohttp.web.Response:
-        payload = await request.json()
-        self.expected_requests = list(map(_make_expected_request, payload))
-        logger.info(f"expected_requests: {list(map(str, self.expected_requests))}")
-        return aiohttp.web.json_response({})
+        response = self._set_requests(await request.json())
+        await self._notify_expected_requests_changed()
+        return aiohttp.web.json_response(response)
 
     async def delete_expected_requests(self, request: aiohttp.web.Request) -> aiohttp.web.Response:
-        self.expected_requests = []
-        return aiohttp.web.json_response({})
+        # Return the unconsumed requests, so that clients can check and clear
+        # the list with a single round-trip.
+        unconsumed = self._take_requests_as_json()
+        await self._notify_expected_requests_changed()
+        return aiohttp.web.json_response(unconsumed)
+
+    async def handle_control_connection(self, reader, writer):
+        """Serve control RPCs over the Unix domain socket.
+
+        The wire format is a 4-byte big-endian length prefix followed by a
+        JSON document, in both directions. Compared to the HTTP endpoints this
+        skips TCP and HTTP processing for the fixture<->mock communication,
+        the HTTP endpoints remain available for manual poking.
+        """
+        try:
+            while True:
+                header = await reader.readexactly(4)
+                (length,) = struct.unpack("!I", header)
+                request = json.loads(await reader.readexactly(length))
+                op = request["op"]
+                if op == "set":
+                    response = self._set_requests(request["requests"])
+                    await self._notify_expected_requests_changed()
+                elif op == "get":
+                    response = self._requests_as_json()
+                elif op == "status":
+                    response = self._status()
+                elif op == "get_and_clear":
+                    response = self._take_requests_as_json()
+                    await self._notify_expected_requests_changed()
+                elif op == "wait_drained":
+                    response = {"drained": await self._wait_drained(request.get("timeout", 5))}
+                else:
+                    raise ValueError(f"unknown control op: {op}")
+                blob = json.dumps(response).encode()
+                writer.write(struct.pack("!I", len(blob)) + blob)
+                await writer.drain()
+        except asyncio.IncompleteReadError:
+            pass  # client disconnected
+        finally:
+            writer.close()
 
     async def handle_generic_request(self, request: aiohttp.web.Request) -> aiohttp.web.Response:
         this_req = expected_request(request.method, request.path, params=dict(request.query))
@@ -182,6 +292,7 @@ class rest_server(aiohttp.abc.AbstractRouter):
 
         if expected_req.multiple == expected_request.ONE:
             del self.expected_requests[0]
+            await self._notify_expected_requests_changed()
         else:
             expected_req.hit += 1
 
@@ -193,7 +304,7 @@ class rest_server(aiohttp.abc.AbstractRouter):
             return aiohttp.web.json_response(expected_req.response, status=expected_req.response_status)
 
 
-async def run_server(ip, port):
+async def run_server(ip, port, sock_path=None):
     logging.basicConfig(
         level=logging.INFO,
         format="%(asctime)s.%(msecs)03d %(levelname)s %(name)s - %(message)s",
@@ -205,6 +316,14 @@ async def run_server(ip, port):
 
     logger.info("start serving")
 
+    # start the control socket before the TCP site: clients take a successful
+    # TCP connect as proof that the whole server is up
+    control_server = None
+    if sock_path is not None:
+        if os.path.exists(sock_path):
+            os.unlink(sock_path)
+        control_server = await asyncio.start_unix_server(server.handle_control_connection, path=sock_path)
+
     runner = aiohttp.web.AppRunner(app)
     await runner.setup()
     site = aiohttp.web.TCPSite(runner, ip, port)
@@ -218,9 +337,54 @@ async def run_server(ip, port):
 
     logger.info("stopping")
 
+    if control_server is not None:
+        control_server.close()
+        await control_server.wait_closed()
+        os.unlink(sock_path)
+
     await runner.cleanup()
 
 
+# Control connections to mock servers, keyed by socket path. Established
+# lazily and kept open, a fixture-side RPC is then a single send + recv.
+_control_connections: Dict[str, socket.socket] = {}
+
+
+def _recvall(sock, length):
+    buf = bytearray()
+    while len(buf) < length:
+        chunk = sock.recv(length - len(buf))
+        if not chunk:
+            raise ConnectionError("mock server closed the control socket")
+        buf += chunk
+    return bytes(buf)
+
+
+def _control_rpc(sock_path, request):
+    """Issue a single RPC over the mock server's control socket.
+
+    Requests and responses are length-prefixed JSON documents, see
+    rest_server.handle_control_connection().
+    """
+    return _control_rpc_raw(sock_path, json.dumps(request).encode())
+
+
+def _control_rpc_raw(sock_path, blob):
+    sock = _control_connections.get(sock_path)
+    if sock is None:
+        sock = socket.socket(socket.AF_UNIX)
+        sock.connect(sock_path)
+        _control_connections[sock_path] = sock
+    try:
+        sock.sendall(struct.pack("!I", len(blob)) + blob)
+        (length,) = struct.unpack("!I", _recvall(sock, 4))
+        return json.loads(_recvall(sock, length))
+    except OSError:
+        del _control_connections[sock_path]
+        sock.close()
+        raise
+
+
 def get_expected_requests(server):
     """Get the expected requests list from the server.
 
@@ -230,8 +394,9 @@ def get_expected_requests(server):
     Params:
     * server - resolved `rest_api_mock_server` fixture (see conftest.py).
     """
-    ip, port = server
-    r = requests.get(f"http://{ip}:{port}/{rest_server.EXPECTED_REQUESTS_PATH}")
+    if getattr(server, "sock", None):
+        return [_make_expected_request(r) for r in _control_rpc(server.sock, {"op": "get"})]
+    r = _session.get(f"http://{server.ip}:{server.port}/{rest_server.EXPECTED_REQUESTS_PATH}")
     r.raise_for_status()
     try:
         return [_make_expected_request(r) for r in r.json()]
@@ -240,29 +405,102 @@ def get_expected_requests(server):
         raise
 
 
+def wait_drained(server, timeout=5):
+    """Wait until all expected requests on the server have been consumed.
+
+    Issues a single long-polling request instead of repeatedly fetching the
+    expected requests list. Returns True if the list drained within the
+    timeout, False otherwise.
+
+    Params:
+    * server - resolved `rest_api_mock_server` fixture (see conftest.py).
+    * timeout - how long to wait (seconds).
+    """
+    if getattr(server, "sock", None):
+        return _control_rpc(server.sock, {"op": "wait_drained", "timeout": timeout})["drained"]
+    r = _session.get(f"http://{server.ip}:{server.port}/{rest_server.EXPECTED_REQUESTS_DRAINED_PATH}",
+                     params={"timeout": timeout})
+    r.raise_for_status()
+    return r.json()["drained"]
+
+
+def get_expected_requests_status(server):
+    """Get the consumption status of the last set expected requests batch.
+
+    Returns a small `{"token": N, "consumed": k, "remaining": m}` document,
+    allowing callers to check that all expected requests arrived without
+    transferring the request list itself.
+
+    Params:
+    * server - resolved `rest_api_mock_server` fixture (see conftest.py).
+    """
+    if getattr(server, "sock", None):
+        return _control_rpc(server.sock, {"op": "status"})
+    r = _session.get(f"http://{server.ip}:{server.port}/{rest_server.EXPECTED_REQUESTS_STATUS_PATH}")
+    r.raise_for_status()
+    return r.json()
+
+
 def clear_expected_requests(server):
     """Clear the expected requests list on the server.
 
     Params:
     * server - resolved `rest_api_mock_server` fixture (see conftest.py).
     """
-    ip, port = server
-    r = requests.delete(f"http://{ip}:{port}/{rest_server.EXPECTED_REQUESTS_PATH}")
+    get_and_clear_expected_requests(server)
+
+
+def get_and_clear_expected_requests(server):
+    """Atomically fetch and clear the expected requests list on the server.
+
+    Returns the unconsumed expected requests, like get_expected_requests(),
+    but clears the list in the same round-trip.
+
+    Params:
+    * server - resolved `rest_api_mock_server` fixture (see conftest.py).
+    """
+    if getattr(server, "sock", None):
+        return [_make_expected_request(r) for r in _control_rpc(server.sock, {"op": "get_and_clear"})]
+    r = _session.delete(f"http://{server.ip}:{server.port}/{rest_server.EXPECTED_REQUESTS_PATH}")
     r.raise_for_status()
+    try:
+        return [_make_expected_request(r) for r in r.json()]
+    except json.decoder.JSONDecodeError:
+        logger.exception('unable to decode server response as JSON: %r', r)
+        raise
 
 
 def set_expected_requests(server, expected_requests):
     """Set the expected requests list on the server.
 
+    Returns a `{"token": N, "count": k}` document identifying the new batch,
+    see get_expected_requests_status().
+
     Params:
     * server - resolved `rest_api_mock_server` fixture (see conftest.py).
     * requests - a list of request objects
     """
-    ip, port = server
-    payload = json.dumps([r.as_json() for r in expected_requests])
-    r = requests.post(f"http://{ip}:{port}/{rest_server.EXPECTED_REQUESTS_PATH}", data=payload)
+    return set_expected_requests_raw(server, json.dumps([r.as_json() for r in expected_requests]).encode())
+
+
+def set_expected_requests_raw(server, payload):
+    """Like set_expected_requests(), but takes the requests pre-serialized.
+
+    Useful for request lists which never change (e.g. the fixed set consumed
+    by scylla-jmx on startup): the JSON can be rendered once and reused,
+    skipping the per-call serialization.
+
+    Params:
+    * server - resolved `rest_api_mock_server` fixture (see conftest.py).
+    * payload - the expected requests as JSON-encoded bytes, as produced by
+      `json.dumps([r.as_json() for r in expected_requests]).encode()`.
+    """
+    if getattr(server, "sock", None):
+        return _control_rpc_raw(server.sock, b'{"op": "set", "requests": ' + payload + b'}')
+    r = _session.post(f"http://{server.ip}:{server.port}/{rest_server.EXPECTED_REQUESTS_PATH}", data=payload)
     r.raise_for_status()
+    return r.json()
 
 
 if __name__ == '__main__':
-    sys.exit(asyncio.run(run_server(sys.argv[1], int(sys.argv[2]))))
+    sys.exit(asyncio.run(run_server(sys.argv[1], int(sys.argv[2]), sys.argv[3] if len(sys.argv) > 3 else None)))
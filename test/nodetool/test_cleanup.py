@@ -5,10 +5,12 @@
 #
 
 from rest_api_mock import expected_request
+import pytest
 import utils
 
 
-def test_cleanup(nodetool, scylla_only):
+@pytest.mark.scylla_only
+def test_cleanup(nodetool):
     nodetool("cleanup", expected_requests=[
         expected_request("POST", "/storage_service/cleanup_all", response=0),
     ])
@@ -10,13 +10,15 @@ import pytest
 
 
 # `scylla nodetool compact` invokes the newly added global compact api
-def test_all_keyspaces(nodetool, scylla_only):
+@pytest.mark.scylla_only
+def test_all_keyspaces(nodetool):
     nodetool("compact", expected_requests=[
         expected_request("POST", "/storage_service/compact")])
 
 
 # The java-based `nodetool compact` lists all keyspaces and invoke the keyspace_compaction api on each of them
-def test_all_keyspaces_jmx(nodetool, cassandra_only):
+@pytest.mark.cassandra_only
+def test_all_keyspaces_jmx(nodetool):
     nodetool("compact", expected_requests=[
         expected_request("GET", "/storage_service/keyspaces", multiple=expected_request.MULTIPLE,
                          response=["system", "system_schema"]),
@@ -77,7 +79,8 @@ def test_token_range_compatibility_argument(nodetool):
     nodetool("compact", "system_schema", "--start-token", "0", "--end-token", "1000", expected_requests=dummy_request)
 
 
-def test_user_defined(nodetool, scylla_only):
+@pytest.mark.scylla_only
+def test_user_defined(nodetool):
     utils.check_nodetool_fails_with(
             nodetool,
             ("compact", "--user-defined", "/var/lib/scylla/data/system/local-7ad54392bcdd35a684174e047860b377/"
@@ -88,7 +91,8 @@ def test_user_defined(nodetool, scylla_only):
 
 @pytest.mark.parametrize("flush", ("true", "false"))
 # The `--flush-memtables` option to `nodetool compact` is available only with `scylla_nodetool`
-def test_keyspace_flush_memtables_option(nodetool, scylla_only, flush):
+@pytest.mark.scylla_only
+def test_keyspace_flush_memtables_option(nodetool, flush):
     params = {"flush_memtables": flush}
     nodetool("compact", "system_schema", "--flush-memtables", flush, expected_requests=[
             expected_request("GET", "/storage_service/keyspaces", multiple=expected_request.MULTIPLE,
@@ -98,7 +102,8 @@ def test_keyspace_flush_memtables_option(nodetool, scylla_only, flush):
 
 @pytest.mark.parametrize("flush", ("true", "false"))
 # The `--flush-memtables` option to `nodetool compact` is available only with `scylla_nodetool`
-def test_all_keyspaces_flush_memtables_option(nodetool, scylla_only, flush):
+@pytest.mark.scylla_only
+def test_all_keyspaces_flush_memtables_option(nodetool, flush):
     params = {"flush_memtables": flush}
     nodetool("compact", "--flush-memtables", flush, expected_requests=[
             expected_request("POST", "/storage_service/compact", params=params)])
@@ -5,18 +5,21 @@
 #
 
 from rest_api_mock import expected_request
+import pytest
 import utils
 
 
 # `scylla nodetool flush` invokes the newly added global flush api
-def test_flush_all_tables(nodetool, scylla_only):
+@pytest.mark.scylla_only
+def test_flush_all_tables(nodetool):
     nodetool("flush", expected_requests=[
         expected_request("POST", "/storage_service/flush")
     ])
 
 
 # The java-based `nodetool flush` lists all keyspaces and invoke the per-keyspace flush api on each of them
-def test_flush_all_tables_jmx(nodetool, cassandra_only):
+@pytest.mark.cassandra_only
+def test_flush_all_tables_jmx(nodetool):
     nodetool("flush", expected_requests=[
             expected_request("GET", "/storage_service/keyspaces", multiple=expected_request.MULTIPLE,
                             response=["ks1", "ks2"]),
@@ -35,7 +35,8 @@ def test_help_nonexistent_command(request, nodetool):
         assert out == "Unknown command foo\n\n"
 
 
-def test_help_command_too_many_args(nodetool, scylla_only):
+@pytest.mark.scylla_only
+def test_help_command_too_many_args(nodetool):
     utils.check_nodetool_fails_with(
             nodetool,
             ("help", "compact", "foo", "bar"),
@@ -43,7 +44,8 @@ def test_help_command_too_many_args(nodetool, scylla_only):
             ["error: too many positional options have been specified on the command line"])
 
 
-def test_help_consistent(nodetool, scylla_only):
+@pytest.mark.scylla_only
+def test_help_consistent(nodetool):
     for command in ("version", "compact", "settraceprobability"):
         out1 = nodetool("help", command)
         # seastar returns 1 when --help is invoked
@@ -5,6 +5,7 @@
 #
 
 from rest_api_mock import expected_request
+import pytest
 import utils
 
 
@@ -26,7 +27,8 @@ def test_setlogginglevel(nodetool):
         expected_request("POST", "/system/logger/wasm", params={"level": "trace"})])
 
 
-def test_setlogginglevel_reset_logger(nodetool, scylla_only):
+@pytest.mark.scylla_only
+def test_setlogginglevel_reset_logger(nodetool):
     utils.check_nodetool_fails_with(
             nodetool,
             ("setlogginglevel", "wasm"),
@@ -34,7 +36,8 @@ def test_setlogginglevel_reset_logger(nodetool, scylla_only):
             ["error processing arguments: resetting logger(s) is not supported yet, the logger and level parameters are required"])
 
 
-def test_setlogginglevel_reset_all_loggers(nodetool, scylla_only):
+@pytest.mark.scylla_only
+def test_setlogginglevel_reset_all_loggers(nodetool):
     utils.check_nodetool_fails_with(
             nodetool,
             ("setlogginglevel",),
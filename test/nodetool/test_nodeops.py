@@ -5,6 +5,7 @@
 #
 
 from rest_api_mock import expected_request
+import pytest
 import utils
 
 
@@ -64,7 +65,8 @@ def test_removenode_force(nodetool):
     assert res == "RemovalStatus: SOME STATUS\n"
 
 
-def test_removenode_status_with_ignore_dead_nodes(nodetool, scylla_only):
+@pytest.mark.scylla_only
+def test_removenode_status_with_ignore_dead_nodes(nodetool):
     utils.check_nodetool_fails_with(
             nodetool,
             ("removenode", "status", "--ignore-dead-nodes", "675ed9f4-6564-6dbd-can8-43fddce952gy"),
@@ -72,7 +74,8 @@ def test_removenode_status_with_ignore_dead_nodes(nodetool, scylla_only):
             ["error processing arguments: cannot use --ignore-dead-nodes with status or force"])
 
 
-def test_removenode_force_with_ignore_dead_nodes(nodetool, scylla_only):
+@pytest.mark.scylla_only
+def test_removenode_force_with_ignore_dead_nodes(nodetool):
     utils.check_nodetool_fails_with(
             nodetool,
             ("removenode", "force", "--ignore-dead-nodes", "675ed9f4-6564-6dbd-can8-43fddce952gy"),
@@ -5,10 +5,12 @@
 #
 
 from rest_api_mock import expected_request
+import pytest
 import subprocess
 
 
-def test_jmx_compatibility_args(nodetool, scylla_only):
+@pytest.mark.scylla_only
+def test_jmx_compatibility_args(nodetool):
     """Check that all JMX arguments inherited to nodetool are ignored.
 
     These arguments are unused in the scylla-native nodetool and should be
@@ -32,7 +34,8 @@ def test_jmx_compatibility_args(nodetool, scylla_only):
              expected_requests=dummy_request)
 
 
-def test_nodetool_no_args(nodetool_path, scylla_only):
+@pytest.mark.scylla_only
+def test_nodetool_no_args(nodetool_path):
     res = subprocess.run([nodetool_path, "nodetool"], capture_output=True, text=True)
 
     assert res.stdout == ""
@@ -46,7 +46,8 @@ def test_refresh_no_table_no_keyspace(nodetool):
              "error processing arguments: required parameters are missing: keyspace and/or table"])
 
 
-def test_refresh_primary_replica_only(nodetool, scylla_only):
+@pytest.mark.scylla_only
+def test_refresh_primary_replica_only(nodetool):
     utils.check_nodetool_fails_with(
             nodetool,
             ("refresh", "ks", "tbl", "--primary-replica-only"),
@@ -38,7 +38,8 @@ def test_scrub_two_tables(nodetool):
 
 
 # Cassandra parser completely borks when positional args are missing
-def test_scrub_nokeyspace(nodetool, scylla_only):
+@pytest.mark.scylla_only
+def test_scrub_nokeyspace(nodetool):
     utils.check_nodetool_fails_with(
             nodetool,
             ("scrub",),
@@ -130,14 +131,16 @@ def test_scrub_ignored_options(nodetool, ignored_opt):
 
 # Cassandra nodetool ignores the returned status
 @pytest.mark.parametrize("status", [scrub_status.successful, scrub_status.aborted, scrub_status.validation_errors])
-def test_scrub_return_status(nodetool, status, cassandra_only):
+@pytest.mark.cassandra_only
+def test_scrub_return_status(nodetool, status):
     nodetool("scrub", "ks", "--mode=VALIDATE", expected_requests=[
         expected_request("GET", "/storage_service/keyspaces", response=["ks"]),
         expected_request("GET", "/storage_service/keyspace_scrub/ks", params={"scrub_mode": "VALIDATE"},
                          response=status.value)])
 
 
-def test_scrub_validation_errors_exit_code(nodetool, scylla_only):
+@pytest.mark.scylla_only
+def test_scrub_validation_errors_exit_code(nodetool):
     nodetool("scrub", "ks", "--mode=VALIDATE", expected_requests=[
         expected_request("GET", "/storage_service/keyspaces", response=["ks"]),
         expected_request("GET", "/storage_service/keyspace_scrub/ks", params={"scrub_mode": "VALIDATE"},
@@ -153,7 +156,8 @@ def test_scrub_validation_errors_exit_code(nodetool, scylla_only):
             ["scrub failed: there are invalid sstables"])
 
 
-def test_scrub_abort_exit_code(nodetool, scylla_only):
+@pytest.mark.scylla_only
+def test_scrub_abort_exit_code(nodetool):
     nodetool("scrub", "ks", "--mode=ABORT", expected_requests=[
         expected_request("GET", "/storage_service/keyspaces", response=["ks"]),
         expected_request("GET", "/storage_service/keyspace_scrub/ks", params={"scrub_mode": "ABORT"},
@@ -33,7 +33,8 @@ def test_clearnapshot_keyspaces(nodetool):
     ])
 
 
-def test_clearnapshot_nonexistent_keyspaces(nodetool, scylla_only):
+@pytest.mark.scylla_only
+def test_clearnapshot_nonexistent_keyspaces(nodetool):
     utils.check_nodetool_fails_with(
             nodetool,
             ("clearsnapshot", "non_existent_ks"),
@@ -276,7 +277,8 @@ def test_snapshot_keyspace_with_ktlist(nodetool):
              " you should not specify keyspace(s)"])
 
 
-def test_snapshot_keyspace_with_tables(nodetool, scylla_only):
+@pytest.mark.scylla_only
+def test_snapshot_keyspace_with_tables(nodetool):
     utils.check_nodetool_fails_with(
             nodetool,
             ("snapshot", "--table", "tbl1", "-cf", "tbl2", "ks1"),
@@ -284,7 +286,8 @@ def test_snapshot_keyspace_with_tables(nodetool, scylla_only):
             ["error: option '--table' cannot be specified more than once"])
 
 
-def test_snapshot_keyspace_bad_ktlist_too_many_dots(nodetool, scylla_only):
+@pytest.mark.scylla_only
+def test_snapshot_keyspace_bad_ktlist_too_many_dots(nodetool):
     utils.check_nodetool_fails_with(
             nodetool,
             ("snapshot", "-kt", "ks1.tbl2.ss,ks2.tbl2"),
@@ -293,7 +296,8 @@ def test_snapshot_keyspace_bad_ktlist_too_many_dots(nodetool, scylla_only):
              "keyspace and table must be separated by exactly one dot"])
 
 
-def test_snapshot_keyspace_bad_ktlist_no_dot(nodetool, scylla_only):
+@pytest.mark.scylla_only
+def test_snapshot_keyspace_bad_ktlist_no_dot(nodetool):
     utils.check_nodetool_fails_with(
             nodetool,
             ("snapshot", "-kt", "ks1.tbl1,ks2"),
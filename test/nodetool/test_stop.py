@@ -5,6 +5,7 @@
 #
 
 from rest_api_mock import expected_request
+import pytest
 import utils
 
 
@@ -20,12 +21,14 @@ def test_stop_common(nodetool):
 
 
 # Even though our docs says it is supported, cassandra-nodetool doesn't know about RESHARD
-def test_stop_reshard(nodetool, scylla_only):
+@pytest.mark.scylla_only
+def test_stop_reshard(nodetool):
     check_compaction_type(nodetool, "RESHARD")
 
 
 # Cassandra calls UPGRADE, UPGRADE_SSTABLES, which the scylla-code doesn't recognize
-def test_stop_upgrade(nodetool, scylla_only):
+@pytest.mark.scylla_only
+def test_stop_upgrade(nodetool):
     check_compaction_type(nodetool, "UPGRADE")
 
 
@@ -57,7 +60,8 @@ def test_stop_unknown(nodetool):
              "error processing arguments: invalid compaction type: FOO"])
 
 
-def test_stop_no_type(nodetool, scylla_only):
+@pytest.mark.scylla_only
+def test_stop_no_type(nodetool):
     utils.check_nodetool_fails_with(
             nodetool,
             ("stop",),
@@ -66,7 +70,8 @@ def test_stop_no_type(nodetool, scylla_only):
 
 
 # This is not implemented, nodetool logs a message and exits
-def test_stop_by_id(nodetool, scylla_only):
+@pytest.mark.scylla_only
+def test_stop_by_id(nodetool):
     expected_error = "error processing arguments: stopping compactions by id is not implemented"
 
     utils.check_nodetool_fails_with(nodetool, ("stop", "-id", "123"), {}, [expected_error])